@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from dataclasses import dataclass, field
 
 
 
@@ -7,35 +8,160 @@ import pandas as pd
 # модуль собирает все значения из master_df и формирует словари,
 # которые соответствуют аргументам оригинального main.py → calculate.*
 
+_NO_ROWS = np.empty(0, dtype=np.intp)
+# общий пустой массив для отсутствующих колонок; только для чтения, чтобы
+# его нельзя было случайно изменить через одного из потребителей
+_EMPTY_F64 = np.empty(0, dtype=np.float64)
+_EMPTY_F64.flags.writeable = False
 
-def prepare_suzun_data(master_df, n, m, prev_days, prev_month, N):
+
+@dataclass(slots=True)
+class TickIndex:
+    """Месяц и строки master_df для одних суток расчёта.
+
+    Даты ищутся один раз на сутки, а не в каждом prepare_*.
+    """
+    m: int                # номер месяца расчётных суток (для calculate.*)
+    month: int            # год и месяц: номер месяца от эпохи (datetime64[M])
+    n_row: int | None     # текущие сутки
+    prev_row: int | None  # предыдущие сутки
+    pm_row: int | None    # последний день прошлого месяца
+
+
+@dataclass(slots=True)
+class DataCache:
+    """Исходные данные расчёта, которые передаются в prepare_* явно.
+
+    master_df хранится по колонкам (SoA): имя колонки -> numpy-массив,
+    поэтому выборки не проходят через механизм индексации pandas.
+    """
+    cols: dict        # имя колонки -> массив значений
+    month_pos: dict   # месяц (datetime64[M] как int64) -> срез строк
+    date_to_row: dict  # номер дня (datetime64[D] как int64) -> номер строки
+    _month_memo: dict = field(default_factory=dict)
+
+    def month_values(self, col, month):
+        """Значения колонки за все дни месяца month (ключ из `_month_key`).
+
+        Месячная выборка одинакова для всех дней месяца и для всех блоков,
+        поэтому считается один раз на пару (колонка, месяц).
+        """
+        key = (col, month)
+        values = self._month_memo.get(key)
+        if values is None:
+            values = self.cols[col][self.month_pos.get(month, _NO_ROWS)]
+            self._month_memo[key] = values
+        return values
+
+    def tick(self, n, prev_days, prev_month):
+        """Индекс одних суток расчёта — строит main один раз на день."""
+        rows = self.date_to_row
+        return TickIndex(
+            m=n.month,
+            month=_month_key(n),
+            n_row=rows.get(_day_key(n)),
+            prev_row=rows.get(_day_key(prev_days)),
+            pm_row=rows.get(_day_key(prev_month)),
+        )
+
+    def day_value(self, col, row):
+        """Значение колонки в строке row; 0.0, если такой даты нет в данных.
+
+        Возвращается скаляр, а не массив из одного элемента: calculate.*
+        всё равно приводит такие аргументы к float через _to_float.
+        """
+        return 0.0 if row is None else self.cols[col][row]
+
+    def day_values(self, row, columns):
+        """Значения нескольких колонок в одной строке (как у `day_value`)."""
+        if row is None:
+            return dict.fromkeys(columns, 0.0)
+        return {col: self.cols[col][row] for col in columns}
+
+
+def _day_key(d):
+    """Ключ даты в DataCache.date_to_row — номер дня от эпохи."""
+    return int(np.datetime64(d, "D").view("i8"))
+
+
+def _month_key(d):
+    """Ключ месяца в DataCache.month_pos — номер месяца от эпохи.
+
+    Учитывает год: один и тот же месяц разных лет не смешивается.
+    """
+    return int(np.datetime64(d, "M").view("i8"))
+
+
+def init_monthly_cache(master_df):
+    """Готовит DataCache один раз перед циклом по дням.
+
+    Колонки переводятся в numpy-массивы, строки каждого месяца (с учётом
+    года) находятся один раз, а не маской `dt.month == m` на каждый запрос,
+    строка конкретной даты — по словарю, а не сравнением всей колонки.
+    master_df сортируется по дате, поэтому месяц хранится срезом — выборка
+    месяца становится view без копирования.
+    """
+    if not master_df["date"].is_monotonic_increasing:
+        master_df = master_df.sort_values("date", kind="stable").reset_index(drop=True)
+    cols = {col: master_df[col].to_numpy() for col in master_df.columns}
+    # После pivot числовые колонки лежат в одном блоке построчно, и каждая
+    # колонка — массив с шагом через всю строку. calculate.* суммирует
+    # месячные выборки по колонкам, поэтому блок один раз транспонируется
+    # в (колонки, дни): каждая колонка и её месячный срез становятся
+    # непрерывными view внутри одного 2D-массива.
+    numeric = [col for col, values in cols.items() if values.dtype == np.float64]
+    if numeric:
+        block = np.ascontiguousarray(master_df[numeric].to_numpy().T)
+        cols.update(zip(numeric, block))
+    # месяц вместе с годом прямо из datetime64[M], без Series от .dt.month;
+    # строки с NaT ни в один месяц не попадают
+    month_keys = master_df["date"].to_numpy("datetime64[M]")
+    months = month_keys.view("i8")[~np.isnat(month_keys)]
+    # строки отсортированы по дате (NaT — в конце), поэтому дни каждого
+    # месяца идут подряд: один проход np.unique даёт начало и длину
+    # каждого месяца, без отдельного сравнения колонки на каждый месяц
+    keys, starts, counts = np.unique(months, return_index=True, return_counts=True)
+    month_pos = {
+        int(month): slice(int(start), int(start + count))
+        for month, start, count in zip(keys, starts, counts)
+    }
+    # ключи — целые номера дней: хэш и сравнение int дешевле, чем у Timestamp
+    day_keys = master_df["date"].to_numpy("datetime64[D]").view("i8").tolist()
+    date_to_row = {d: i for i, d in enumerate(day_keys)}
+    return DataCache(cols=cols, month_pos=month_pos, date_to_row=date_to_row)
+
+
+def prepare_suzun_data(cache, tick, N):
     """Собирает все аргументы, которые в оригинале передавались в calculate.suzun."""
     # --- Покупка и отгрузка ---
-    G_buy_month = master_df.loc[master_df["date"].dt.month == m, "buying_oil"].values
-    G_out_udt_month = master_df.loc[master_df["date"].dt.month == m, "out_udt"].values
+    G_buy_month = cache.month_values("buying_oil", tick.month)
+    G_out_udt_month = cache.month_values("out_udt", tick.month)
     # --- GTM данные ---
-    Q_vankor = master_df.loc[master_df["date"].dt.month == m, "gtm_vn"].values
-    Q_suzun = master_df.loc[master_df["date"].dt.month == m, "gtm_suzun"].values
-    Q_vslu = master_df.loc[master_df["date"].dt.month == m, "gtm_vslu"].values
-    Q_tng = master_df.loc[master_df["date"].dt.month == m, "gtm_taymyr"].values
-    Q_vo = master_df.loc[master_df["date"].dt.month == m, "gtm_vostok"].values
-    G_per_data = master_df.loc[master_df["date"].dt.month == m, "per_data"].values
-    G_suzun_vslu_data = master_df.loc[master_df["date"].dt.month == m, "suzun_vslu_data"].values
-    G_suzun_slu_data = master_df.loc[master_df["date"].dt.month == m, "suzun_slu_data"].values
-    G_suzun_data = master_df.loc[master_df["date"].dt.month == m, "suzun_data"].values
+    Q_vankor = cache.month_values("gtm_vn", tick.month)
+    Q_suzun = cache.month_values("gtm_suzun", tick.month)
+    Q_vslu = cache.month_values("gtm_vslu", tick.month)
+    Q_tng = cache.month_values("gtm_taymyr", tick.month)
+    Q_vo = cache.month_values("gtm_vostok", tick.month)
+    G_per_data = cache.month_values("per_data", tick.month)
+    G_suzun_vslu_data = cache.month_values("suzun_vslu_data", tick.month)
+    G_suzun_slu_data = cache.month_values("suzun_slu_data", tick.month)
+    G_suzun_data = cache.month_values("suzun_data", tick.month)
 
     # --- Данные за текущий день ---
-    Q_vslu_day = master_df.loc[master_df["date"] == n, "gtm_vslu"].values
-    Q_suzun_day = master_df.loc[master_df["date"] == n, "gtm_suzun"].values
+    day = cache.day_values(tick.n_row, ("gtm_vslu", "gtm_suzun"))
+    Q_vslu_day = day["gtm_vslu"]
+    Q_suzun_day = day["gtm_suzun"]
     # --- Предыдущий день ---
-    V_suzun_tng_prev = master_df.loc[master_df["date"] == prev_days, "suzun_tng"].values
-    V_upn_suzun_prev = master_df.loc[master_df["date"] == prev_days, "upn_suzun"].values
-    V_suzun_vslu_prev = master_df.loc[master_df["date"] == prev_days, "suzun_vslu"].values
+    prev = cache.day_values(tick.prev_row, ("suzun_tng", "upn_suzun", "suzun_vslu", "suzun_slu"))
+    V_suzun_tng_prev = prev["suzun_tng"]
+    V_upn_suzun_prev = prev["upn_suzun"]
+    V_suzun_vslu_prev = prev["suzun_vslu"]
     # --- Конец прошлого месяца ---
-    V_suzun_tng_0 = master_df.loc[master_df["date"] == prev_month, "suzun_tng"].values
-    V_upn_suzun_0 = master_df.loc[master_df["date"] == prev_month, "upn_suzun"].values
-    V_suzun_vslu_0 = master_df.loc[master_df["date"] == prev_month, "suzun_vslu"].values
-    V_suzun_slu_prev = master_df.loc[master_df["date"] == prev_days, "suzun_slu"].values
+    month_end = cache.day_values(tick.pm_row, ("suzun_tng", "upn_suzun", "suzun_vslu"))
+    V_suzun_tng_0 = month_end["suzun_tng"]
+    V_upn_suzun_0 = month_end["upn_suzun"]
+    V_suzun_vslu_0 = month_end["suzun_vslu"]
+    V_suzun_slu_prev = prev["suzun_slu"]
 
     return {
         "G_buy_month":G_buy_month,
@@ -63,40 +189,46 @@ def prepare_suzun_data(master_df, n, m, prev_days, prev_month, N):
     }
 
 
-def prepare_vo_data(master_df, n, m):
-    Q_vo_day = master_df.loc[master_df["date"] == n, "gtm_vostok"].values
-    G_upn_lodochny_ichem_data = master_df.loc[master_df["date"].dt.month == m, "upn_lodochny_ichem_data"].values
+def prepare_vo_data(cache, tick):
+    Q_vo_day = cache.day_value("gtm_vostok", tick.n_row)
+    G_upn_lodochny_ichem_data = cache.month_values("upn_lodochny_ichem_data", tick.month)
 
-    return {"Q_vo_day": Q_vo_day, "G_upn_lodochny_ichem_data": G_upn_lodochny_ichem_data, "m":m}
+    return {"Q_vo_day": Q_vo_day, "G_upn_lodochny_ichem_data": G_upn_lodochny_ichem_data, "m":tick.m}
 
 
-def prepare_kchng_data(master_df, n, m):
-    Q_kchng = master_df.loc[master_df["date"].dt.month == m, "kchng"].values if "kchng" in master_df.columns else np.array([])
-    Q_kchng_day = master_df.loc[master_df["date"] == n, "kchng"].values if "kchng" in master_df.columns else np.array([])
-    G_kchng_data = master_df.loc[master_df["date"].dt.month == m, "kchng_data"].values
+def prepare_kchng_data(cache, tick):
+    if "kchng" in cache.cols:
+        Q_kchng = cache.month_values("kchng", tick.month)
+        Q_kchng_day = cache.day_value("kchng", tick.n_row)
+    else:
+        Q_kchng = Q_kchng_day = _EMPTY_F64
+    G_kchng_data = cache.month_values("kchng_data", tick.month)
 
     return {"Q_kchng_day":Q_kchng_day, "Q_kchng":Q_kchng, "G_kchng_data":G_kchng_data}
 
 
-def prepare_lodochny_data(master_df, n, m, prev_days, prev_month, N, day, kchng_results):
-    Q_tagulsk_prev_month = master_df.loc[master_df["date"] == prev_month, "gtm_tagulsk"].values
-    G_lodochni_upsv_yu_prev_month = master_df.loc[master_df["date"] == prev_month, "lodochni_upsv_yu"].values
-    Q_tagulsk = master_df.loc[master_df["date"].dt.month == m, "gtm_tagulsk"].values
-    Q_lodochny = master_df.loc[master_df["date"].dt.month == m, "gtm_lodochny"].values
-    Q_lodochny_day = master_df.loc[master_df["date"] == n, "gtm_lodochny"].values
-    Q_tagulsk_day = master_df.loc[master_df["date"] == n, "gtm_tagulsk"].values
-    V_upn_lodochny_prev = master_df.loc[master_df["date"] == prev_days, "upn_lodochny"].values
-    V_ichem_prev = master_df.loc[master_df["date"] == prev_days, "ichem"].values
-    G_lodochny_ichem = master_df.loc[master_df["date"] == n, "lodochny_ichem"].values
-    V_tagul = master_df.loc[master_df["date"] == n, "tagul"].values
-    V_tagul_prev = master_df.loc[master_df["date"] == prev_days, "tagul"].values
-    G_lodochny_uspv_yu_data = master_df.loc[master_df["date"].dt.month == m, "lodochny_uspv_yu_data"].values
-    G_sikn_tagul_data = master_df.loc[master_df["date"].dt.month == m, "sikn_tagul_data"].values
-    G_tagul_data = master_df.loc[master_df["date"].dt.month == m, "tagul_data"].values
-    delte_G_tagul_data = master_df.loc[master_df["date"].dt.month == m, "delte_tagul_data"].values
-    G_lodochny_data = master_df.loc[master_df["date"].dt.month == m, "lodochny_data"].values
-    delte_G_upn_lodochny_data = master_df.loc[master_df["date"].dt.month == m, "delte_upn_lodochny_data"].values
-    G_tagul_lodochny_data = master_df.loc[master_df["date"].dt.month == m, "tagul_lodochny_data"].values
+def prepare_lodochny_data(cache, tick, N, day, kchng_results):
+    today = cache.day_values(tick.n_row, ("gtm_lodochny", "gtm_tagulsk", "lodochny_ichem", "tagul", "gtm_vostok"))
+    prev = cache.day_values(tick.prev_row, ("upn_lodochny", "ichem", "tagul"))
+    month_end = cache.day_values(tick.pm_row, ("gtm_tagulsk", "lodochni_upsv_yu"))
+    Q_tagulsk_prev_month = month_end["gtm_tagulsk"]
+    G_lodochni_upsv_yu_prev_month = month_end["lodochni_upsv_yu"]
+    Q_tagulsk = cache.month_values("gtm_tagulsk", tick.month)
+    Q_lodochny = cache.month_values("gtm_lodochny", tick.month)
+    Q_lodochny_day = today["gtm_lodochny"]
+    Q_tagulsk_day = today["gtm_tagulsk"]
+    V_upn_lodochny_prev = prev["upn_lodochny"]
+    V_ichem_prev = prev["ichem"]
+    G_lodochny_ichem = today["lodochny_ichem"]
+    V_tagul = today["tagul"]
+    V_tagul_prev = prev["tagul"]
+    G_lodochny_uspv_yu_data = cache.month_values("lodochny_uspv_yu_data", tick.month)
+    G_sikn_tagul_data = cache.month_values("sikn_tagul_data", tick.month)
+    G_tagul_data = cache.month_values("tagul_data", tick.month)
+    delte_G_tagul_data = cache.month_values("delte_tagul_data", tick.month)
+    G_lodochny_data = cache.month_values("lodochny_data", tick.month)
+    delte_G_upn_lodochny_data = cache.month_values("delte_upn_lodochny_data", tick.month)
+    G_tagul_lodochny_data = cache.month_values("tagul_lodochny_data", tick.month)
 
     return {
         "Q_tagul":Q_tagulsk,
@@ -107,7 +239,7 @@ def prepare_lodochny_data(master_df, n, m, prev_days, prev_month, N, day, kchng_
         "Q_tagul_prev_month":Q_tagulsk_prev_month,
         "G_lodochni_upsv_yu_prev_month":G_lodochni_upsv_yu_prev_month,
         "N":N,
-        "Q_vo_day":master_df.loc[master_df["date"] == n, "gtm_vostok"].values,
+        "Q_vo_day":today["gtm_vostok"],
         "Q_lodochny_day":Q_lodochny_day,
         "Q_tagul_day":Q_tagulsk_day,
         "V_tagul":V_tagul,
@@ -124,19 +256,23 @@ def prepare_lodochny_data(master_df, n, m, prev_days, prev_month, N, day, kchng_
     }
 
 
-def prepare_cppn1_data(master_df, n, prev_days, prev_month, lodochny_results):
+def prepare_cppn1_data(cache, tick, lodochny_results):
     flag_list = [0, 0, 0] # Для отслеживания остановки
-    V_upsv_yu_0 = master_df.loc[master_df["date"] == prev_month, "upsv_yu"].values
-    V_upsv_s_0 = master_df.loc[master_df["date"] == prev_month, "upsv_s"].values
-    V_upsv_cps_0 = master_df.loc[master_df["date"] == prev_month, "upsv_cps"].values
-    V_upsv_yu_prev = master_df.loc[master_df["date"] == prev_days, "upsv_yu"].values
-    V_upsv_s_prev = master_df.loc[master_df["date"] == prev_days, "upsv_s"].values
-    V_upsv_cps_prev = master_df.loc[master_df["date"] == prev_days, "upsv_cps"].values
-    V_upsv_yu = master_df.loc[master_df["date"] == n, "upsv_yu"].values
-    V_upsv_s = master_df.loc[master_df["date"] == n, "upsv_s"].values
-    V_upsv_cps = master_df.loc[master_df["date"] == n, "upsv_cps"].values
-    V_lodochny_cps_upsv_yu_prev = master_df.loc[master_df["date"] == prev_days, "lodochny_cps_upsv_yu"].values
-    V_lodochny_upsv_yu = master_df.loc[master_df["date"] == prev_days, "lodochny_upsv_yu"].values
+    upsv = ("upsv_yu", "upsv_s", "upsv_cps")
+    month_end = cache.day_values(tick.pm_row, upsv)
+    prev = cache.day_values(tick.prev_row, upsv + ("lodochny_cps_upsv_yu", "lodochny_upsv_yu"))
+    today = cache.day_values(tick.n_row, upsv)
+    V_upsv_yu_0 = month_end["upsv_yu"]
+    V_upsv_s_0 = month_end["upsv_s"]
+    V_upsv_cps_0 = month_end["upsv_cps"]
+    V_upsv_yu_prev = prev["upsv_yu"]
+    V_upsv_s_prev = prev["upsv_s"]
+    V_upsv_cps_prev = prev["upsv_cps"]
+    V_upsv_yu = today["upsv_yu"]
+    V_upsv_s = today["upsv_s"]
+    V_upsv_cps = today["upsv_cps"]
+    V_lodochny_cps_upsv_yu_prev = prev["lodochny_cps_upsv_yu"]
+    V_lodochny_upsv_yu = prev["lodochny_upsv_yu"]
     return {
         "V_upsv_yu_prev":V_upsv_yu_prev,
         "V_upsv_s_prev":V_upsv_s_prev,
@@ -154,27 +290,28 @@ def prepare_cppn1_data(master_df, n, prev_days, prev_month, lodochny_results):
     }
 
 
-def prepare_rn_vankor_data(master_df, n, prev_days, N, day,m):
-    F_vn = master_df.loc[master_df["date"].dt.month == m, "volume_vankor"].values
-    F_suzun_obsh = master_df.loc[master_df["date"].dt.month == m, "volume_suzun"].values
-    F_suzun_vankor = master_df.loc[master_df["date"].dt.month == m, "suzun_vankor"].values
-    V_ctn_suzun_vslu_norm = master_df.loc[master_df["date"] == prev_days, "ctn_suzun_vslu_norm"].values
-    V_ctn_suzun_vslu = master_df.loc[master_df["date"] == n, "ctn_suzun_vslu"].values
-    F_tagul_lpu = master_df.loc[master_df["date"].dt.month == m, "volume_lodochny"].values
-    F_tagul_tpu = master_df.loc[master_df["date"].dt.month == m, "volume_tagulsk"].values
-    F_skn = master_df.loc[master_df["date"] == n, "skn"].values
-    F_vo = master_df.loc[master_df["date"].dt.month == m, "volume_vostok_oil"].values
-    F_kchng = master_df.loc[master_df["date"].dt.month == m, "volum_kchng"].values
-    F_bp_data = master_df.loc[master_df["date"].dt.month == m, "bp_data"].values
-    F_bp_vn_data = master_df.loc[master_df["date"].dt.month == m, "bp_vn_data"].values
-    F_bp_suzun_data = master_df.loc[master_df["date"].dt.month == m, "bp_suzun_data"].values
-    F_bp_suzun_vankor_data = master_df.loc[master_df["date"].dt.month == m, "bp_suzun_vankor_data"].values
-    F_bp_suzun_vslu_data = master_df.loc[master_df["date"].dt.month == m, "bp_suzun_vslu_data"].values
-    F_bp_tagul_lpu_data = master_df.loc[master_df["date"].dt.month == m, "bp_tagul_lpu_data"].values
-    F_bp_tagul_tpu_data = master_df.loc[master_df["date"].dt.month == m, "bp_tagul_tpu_data"].values
-    F_bp_skn_data = master_df.loc[master_df["date"].dt.month == m, "bp_skn_data"].values
-    F_bp_vo_data = master_df.loc[master_df["date"].dt.month == m, "bp_vo_data"].values
-    F_bp_kchng_data = master_df.loc[master_df["date"].dt.month == m, "bp_kchng_data"].values
+def prepare_rn_vankor_data(cache, tick, N, day):
+    F_vn = cache.month_values("volume_vankor", tick.month)
+    F_suzun_obsh = cache.month_values("volume_suzun", tick.month)
+    F_suzun_vankor = cache.month_values("suzun_vankor", tick.month)
+    today = cache.day_values(tick.n_row, ("ctn_suzun_vslu", "skn"))
+    V_ctn_suzun_vslu_norm = cache.day_value("ctn_suzun_vslu_norm", tick.prev_row)
+    V_ctn_suzun_vslu = today["ctn_suzun_vslu"]
+    F_tagul_lpu = cache.month_values("volume_lodochny", tick.month)
+    F_tagul_tpu = cache.month_values("volume_tagulsk", tick.month)
+    F_skn = today["skn"]
+    F_vo = cache.month_values("volume_vostok_oil", tick.month)
+    F_kchng = cache.month_values("volum_kchng", tick.month)
+    F_bp_data = cache.month_values("bp_data", tick.month)
+    F_bp_vn_data = cache.month_values("bp_vn_data", tick.month)
+    F_bp_suzun_data = cache.month_values("bp_suzun_data", tick.month)
+    F_bp_suzun_vankor_data = cache.month_values("bp_suzun_vankor_data", tick.month)
+    F_bp_suzun_vslu_data = cache.month_values("bp_suzun_vslu_data", tick.month)
+    F_bp_tagul_lpu_data = cache.month_values("bp_tagul_lpu_data", tick.month)
+    F_bp_tagul_tpu_data = cache.month_values("bp_tagul_tpu_data", tick.month)
+    F_bp_skn_data = cache.month_values("bp_skn_data", tick.month)
+    F_bp_vo_data = cache.month_values("bp_vo_data", tick.month)
+    F_bp_kchng_data = cache.month_values("bp_kchng_data", tick.month)
 
     return {
         "F_vn":F_vn,
@@ -200,21 +337,24 @@ def prepare_rn_vankor_data(master_df, n, prev_days, N, day,m):
         "F_bp_vo_data":F_bp_vo_data,
         "F_bp_kchng_data":F_bp_kchng_data,
     }
-def prepare_sikn_1208_data(master_df, n, prev_days, m, suzun_results, lodochny_results, G_suzun_tng, cppn1_results):
-    G_suzun_sikn_data = master_df.loc[master_df["date"].dt.month == m, "suzun_sikn_data"].values
-    G_sikn_suzun_data = master_df.loc[master_df["date"].dt.month == m, "sikn_suzun_data"].values
-    G_suzun_tng_data = master_df.loc[master_df["date"].dt.month == m, "suzun_tng_data"].values
-    G_sikn_data = master_df.loc[master_df["date"].dt.month == m, "sikn_data"].values
-    G_sikn_vankor_data = master_df.loc[master_df["date"].dt.month == m, "sikn_vankor_data"].values
-    G_skn_data = master_df.loc[master_df["date"].dt.month == m, "skn_data"].values
-
-    Q_vankor = master_df.loc[master_df["date"] == n, "gtm_vn"].values
-    V_upsv_yu = master_df.loc[master_df["date"] == n, "upsv_yu"].values
-    V_upsv_s = master_df.loc[master_df["date"] == n, "upsv_s"].values
-    V_upsv_cps = master_df.loc[master_df["date"] == n, "upsv_cps"].values
-    V_upsv_yu_prev = master_df.loc[master_df["date"] == prev_days, "upsv_yu"].values
-    V_upsv_s_prev = master_df.loc[master_df["date"] == prev_days, "upsv_s"].values
-    V_upsv_cps_prev = master_df.loc[master_df["date"] == prev_days, "upsv_cps"].values
+def prepare_sikn_1208_data(cache, tick, suzun_results, lodochny_results, G_suzun_tng, cppn1_results):
+    G_suzun_sikn_data = cache.month_values("suzun_sikn_data", tick.month)
+    G_sikn_suzun_data = cache.month_values("sikn_suzun_data", tick.month)
+    G_suzun_tng_data = cache.month_values("suzun_tng_data", tick.month)
+    G_sikn_data = cache.month_values("sikn_data", tick.month)
+    G_sikn_vankor_data = cache.month_values("sikn_vankor_data", tick.month)
+    G_skn_data = cache.month_values("skn_data", tick.month)
+
+    upsv = ("upsv_yu", "upsv_s", "upsv_cps")
+    today = cache.day_values(tick.n_row, ("gtm_vn",) + upsv)
+    prev = cache.day_values(tick.prev_row, upsv)
+    Q_vankor = today["gtm_vn"]
+    V_upsv_yu = today["upsv_yu"]
+    V_upsv_s = today["upsv_s"]
+    V_upsv_cps = today["upsv_cps"]
+    V_upsv_yu_prev = prev["upsv_yu"]
+    V_upsv_s_prev = prev["upsv_s"]
+    V_upsv_cps_prev = prev["upsv_cps"]
     return {
         "G_suzun_vslu": suzun_results.get("G_suzun_vslu"),
         "G_sikn_tagul_lod_data": lodochny_results.get("G_sikn_tagul_month"),
@@ -238,36 +378,41 @@ def prepare_sikn_1208_data(master_df, n, prev_days, m, suzun_results, lodochny_r
         "V_cppn_1":cppn1_results.get("V_cppn_1"),
         "G_skn_data":G_skn_data,
     }
-def prepare_TSTN_data (master_df, n,prev_days,prev_month,m,N,sikn_1208_results,lodochny_results,kchng_results, suzun_results,G_ichem,G_suzun_tng):
-    V_gnsp_0 = master_df.loc[master_df["date"] == prev_month, "gnsp"].values
-    V_nps_1_0 = master_df.loc[master_df["date"] == prev_month, "nps_1"].values
-    V_nps_2_0 = master_df.loc[master_df["date"] == prev_month, "nps_2"].values
-    V_knps_0 = master_df.loc[master_df["date"] == prev_month, "knps"].values
-    V_suzun_put_0 = master_df.loc[master_df["date"] == prev_month, "suzun_put"].values
-
-    V_knps_prev = master_df.loc[master_df["date"] == prev_days, "knps"].values
-    V_gnsp_prev = master_df.loc[master_df["date"] == prev_days, "gnsp"].values
-    V_nps_1_prev = master_df.loc[master_df["date"] == prev_days, "nps_1"].values
-    V_nps_2_prev = master_df.loc[master_df["date"] == prev_days, "nps_2"].values
-    V_tstn_suzun_vslu_prev = master_df.loc[master_df["date"] == prev_days, "tstn_vslu"].values
-    V_tstn_suzun_vankor_prev = master_df.loc[master_df["date"] == prev_days, "tstn_suzun_vankor"].values
-    V_tstn_suzun_prev = master_df.loc[master_df["date"] == prev_days, "tstn_suzun"].values
-    V_tstn_skn_prev = master_df.loc[master_df["date"] == prev_days, "tstn_skn"].values
-    V_tstn_vo_prev = master_df.loc[master_df["date"] == prev_days, "tstn_vo"].values
-    V_tstn_tng_prev = master_df.loc[master_df["date"] == prev_days, "tstn_tng"].values
-    V_tstn_tagul_prev = master_df.loc[master_df["date"] == prev_days, "tstn_tagul"].values
-    V_tstn_kchng_prev = master_df.loc[master_df["date"] == prev_days, "tstn_kchng"].values
-    V_tstn_lodochny_prev = master_df.loc[master_df["date"] == prev_days, "tstn_lodochny"].values
-    V_tstn_rn_vn_prev = master_df.loc[master_df["date"] == prev_days, "tstn_rn_vn"].values
-
-    F_kchng = master_df.loc[master_df["date"].dt.month == m, "volum_kchng"].values
-    G_gpns_data = master_df.loc[master_df["date"].dt.month == m, "gpns_data"].values
-    F_suzun_vankor = master_df.loc[master_df["date"].dt.month == m, "suzun_vankor"].values
-    F_vo = master_df.loc[master_df["date"].dt.month == m, "volume_vostok_oil"].values
-    F_tng = master_df.loc[master_df["date"].dt.month == m, "volume_taymyr"].values
-    F_tagul_lpu = master_df.loc[master_df["date"].dt.month == m, "volume_lodochny"].values
-
-    F_skn = master_df.loc[master_df["date"]== n, "_F_skn"].values
+def prepare_TSTN_data(cache, tick, N, sikn_1208_results, lodochny_results, kchng_results, suzun_results, G_ichem, G_suzun_tng):
+    month_end = cache.day_values(tick.pm_row, ("gnsp", "nps_1", "nps_2", "knps", "suzun_put"))
+    V_gnsp_0 = month_end["gnsp"]
+    V_nps_1_0 = month_end["nps_1"]
+    V_nps_2_0 = month_end["nps_2"]
+    V_knps_0 = month_end["knps"]
+    V_suzun_put_0 = month_end["suzun_put"]
+
+    prev = cache.day_values(tick.prev_row, (
+        "knps", "gnsp", "nps_1", "nps_2", "tstn_vslu", "tstn_suzun_vankor", "tstn_suzun", "tstn_skn",
+        "tstn_vo", "tstn_tng", "tstn_tagul", "tstn_kchng", "tstn_lodochny", "tstn_rn_vn",
+    ))
+    V_knps_prev = prev["knps"]
+    V_gnsp_prev = prev["gnsp"]
+    V_nps_1_prev = prev["nps_1"]
+    V_nps_2_prev = prev["nps_2"]
+    V_tstn_suzun_vslu_prev = prev["tstn_vslu"]
+    V_tstn_suzun_vankor_prev = prev["tstn_suzun_vankor"]
+    V_tstn_suzun_prev = prev["tstn_suzun"]
+    V_tstn_skn_prev = prev["tstn_skn"]
+    V_tstn_vo_prev = prev["tstn_vo"]
+    V_tstn_tng_prev = prev["tstn_tng"]
+    V_tstn_tagul_prev = prev["tstn_tagul"]
+    V_tstn_kchng_prev = prev["tstn_kchng"]
+    V_tstn_lodochny_prev = prev["tstn_lodochny"]
+    V_tstn_rn_vn_prev = prev["tstn_rn_vn"]
+
+    F_kchng = cache.month_values("volum_kchng", tick.month)
+    G_gpns_data = cache.month_values("gpns_data", tick.month)
+    F_suzun_vankor = cache.month_values("suzun_vankor", tick.month)
+    F_vo = cache.month_values("volume_vostok_oil", tick.month)
+    F_tng = cache.month_values("volume_taymyr", tick.month)
+    F_tagul_lpu = cache.month_values("volume_lodochny", tick.month)
+
+    F_skn = cache.day_value("_F_skn", tick.n_row)
     VN_min_gnsp = 2686.761
     flag_list = [0,0,0,0]
     return {
@@ -1,9 +1,26 @@
-from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
 from openpyxl.comments import Comment
+import numpy as np
 import pandas as pd
 
 
+def _find_row(values: pd.Series, calc_date):
+    """
+    Номер строки листа (с учётом заголовка) для calc_date или None.
+
+    Строки листа идут в том же порядке, что и в DataFrame, поэтому дата
+    ищется в самом DataFrame: по отсортированной колонке — бинарным
+    поиском, иначе — одним векторным сравнением, без обхода ячеек листа.
+    """
+    if values.is_monotonic_increasing:
+        i = int(values.searchsorted(calc_date))
+        if i < len(values) and values.iloc[i] == calc_date:
+            return i + 2
+        return None
+    hits = np.flatnonzero(values.to_numpy() == calc_date)
+    return int(hits[0]) + 2 if len(hits) else None
+
+
 def export_to_excel(
     master_df: pd.DataFrame,
     output_path: str,
@@ -27,53 +44,55 @@ def export_to_excel(
         col for col in master_df.columns
     ]
 
-    export_df = master_df[export_columns].copy()
+    # только чтение: копия всего DataFrame перед to_excel не нужна
+    export_df = master_df[export_columns]
 
     # =========================================================
-    # 2. Сохраняем DataFrame
-    export_df.to_excel(output_path, index=False)
+    # 2. Сохраняем DataFrame и, если есть тревога, сразу размечаем лист —
+    # файл пишется один раз, без повторного чтения и пересохранения
+    status = None
+    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
+        export_df.to_excel(writer, sheet_name="Sheet1", index=False)
+        if alarm_flag:
+            ws = writer.sheets["Sheet1"]
+            status = _mark_alarm(ws, export_df, calc_date, alarm_msg, month_column_name)
 
-    # Если тревоги нет — на этом всё
+    # =========================================================
+    # 6. Сообщаем, что сохранено
     if not alarm_flag:
         print(f"Результат сохранён в {output_path}")
-        return
+    elif status == "no_column":
+        print(
+            f"Колонка '{month_column_name}' не найдена — файл сохранён без подсветки"
+        )
+    elif status == "no_date":
+        print("Дата расчёта не найдена — файл сохранён без подсветки")
+    else:
+        print(f"Результат сохранён в {output_path} (с предупреждением)")
 
-    # =========================================================
-    # 3. Открываем Excel для форматирования
-    wb = load_workbook(output_path)
-    ws = wb.active
 
+def _mark_alarm(ws, export_df: pd.DataFrame, calc_date, alarm_msg, month_column_name: str) -> str:
+    """
+    Красит ячейку месячного значения за calc_date и добавляет комментарий.
+    Возвращает "ok", либо "no_column" / "no_date", если отмечать нечего.
+    """
     # =========================================================
-    # 4. Находим колонку месячного значения
-    headers = [cell.value for cell in ws[1]]
+    # 3. Находим колонку месячного значения
+    headers = list(export_df.columns)
     if month_column_name not in headers:
-        wb.save(output_path)
-        print(
-            f"Колонка '{month_column_name}' не найдена — файл сохранён без подсветки"
-        )
-        return
+        return "no_column"
 
     col_idx = headers.index(month_column_name) + 1
 
     # =========================================================
-    # 5. Ищем строку расчётной даты
-    target_row = None
-    for row in range(2, ws.max_row + 1):
-        cell_value = ws.cell(row=row, column=1).value
-        if cell_value == calc_date:
-            target_row = row
-            break
-
+    # 4. Ищем строку расчётной даты
+    target_row = _find_row(export_df.iloc[:, 0], calc_date)
     if target_row is None:
-        wb.save(output_path)
-        print("Дата расчёта не найдена — файл сохранён без подсветки")
-        return
+        return "no_date"
 
     # =========================================================
-    # 6. Красим и добавляем комментарий
+    # 5. Красим и добавляем комментарий
     cell = ws.cell(row=target_row, column=col_idx)
     cell.fill = PatternFill("solid", fgColor="FF9999")
     cell.comment = Comment(alarm_msg or "Контрольное условие не выполнено", "СППР")
-
-    wb.save(output_path)
-    print(f"Результат сохранён в {output_path} (с предупреждением)")
\ No newline at end of file
+    return "ok"
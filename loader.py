@@ -1,11 +1,19 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import calendar
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from config import FILE_NAMES, DIR, EXCEL_SETTINGS
 # -------------------------
 # Вспомогательные функции
 # -------------------------
+# кодировка месяцев
+MONTH_MAP = {
+    'январь': 1, 'февраль': 2, 'март': 3, 'апрель': 4,
+    'май': 5, 'июнь': 6, 'июль': 7, 'август': 8,
+    'сентябрь': 9, 'октябрь': 10, 'ноябрь': 11, 'декабрь': 12
+}
 def parse_month(raw):
     """
     Распознаёт дату формата 'Месяц, YYYY'
@@ -13,38 +21,84 @@ def parse_month(raw):
     """
     if not isinstance(raw, str):
         raw = str(raw)
-    # кодировка месяцев
-    month_map = {
-        'январь': 1, 'февраль': 2, 'март': 3, 'апрель': 4,
-        'май': 5, 'июнь': 6, 'июль': 7, 'август': 8,
-        'сентябрь': 9, 'октябрь': 10, 'ноябрь': 11, 'декабрь': 12
-    }
     raw = raw.strip().lower()
     if "," in raw:
         parts = raw.split(',')
         month_name = parts[0].strip().lower()
         year = int(parts[1].strip())
-        month_number = month_map.get(month_name)
+        month_number = MONTH_MAP.get(month_name)
         if month_number:
             return datetime(year, month_number, 1)
     try:
         return pd.to_datetime(raw, errors="coerce")
     except Exception:
         return pd.NaT
+def safe_to_numeric(col: pd.Series) -> pd.Series:
+    """
+    Приводит колонку значений к числу, нечисловое и пропуски -> 0.
+    Колонка, уже прочитанная как числовая, не проходит поэлементный
+    разбор pd.to_numeric: целые берутся как есть, у дробных заполняются NaN.
+    """
+    kind = col.dtype.kind
+    if kind in "iu":
+        return col
+    if kind == "f":
+        return col.fillna(0)
+    return pd.to_numeric(col, errors="coerce").fillna(0)
 def safe_to_datetime(val):
     return pd.to_datetime(val, errors="coerce")
 def ensure_list(x):
     return x if isinstance(x, list) else [x]
 def get_day():
-    """Возвращает список дат для текущего месяца."""
-    today = datetime.now().replace(day=1)  # Первый день текущего месяца
-    year, month = today.year, today.month
-    total_days = calendar.monthrange(year, month)[1]
-    dates = [today + timedelta(days=i) for i in range(total_days)]
-    return dates
+    """Возвращает даты текущего месяца (DatetimeIndex, время обнулено)."""
+    first_day = pd.Timestamp.now().normalize().replace(day=1)  # Первый день текущего месяца
+    return pd.date_range(first_day, periods=first_day.days_in_month, freq="D")
 # -------------------------
 # Загрузка и подготовка одного файла
 # -------------------------
+def _skiprows_key(skiprows):
+    """skiprows в хэшируемом виде — для ключа кэша _read_sheet."""
+    return tuple(skiprows) if skiprows is not None else None
+@lru_cache(maxsize=None)
+def _rows_by_sheet() -> Dict[tuple, Optional[int]]:
+    """
+    Сколько строк каждого листа нужно ключам EXCEL_SETTINGS, читающим его.
+    При transpose=True колонки настройки — это номера строк листа, и строки
+    ниже max(columns) не нужны; None — лист нужен целиком.
+    """
+    rows = {}
+    for key, config in EXCEL_SETTINGS.items():
+        need = _rows_needed(config.columns, config.transpose)
+        for f in ensure_list(getattr(FILE_NAMES, key, [])):
+            sheet = (f, config.sheet_name, _skiprows_key(config.skiprows))
+            have = rows.get(sheet, 0)
+            rows[sheet] = None if need is None or have is None else max(have, need)
+    return rows
+def _rows_needed(columns, transpose) -> Optional[int]:
+    if not transpose or min(columns) < 0:
+        return None
+    return max(columns) + 1
+def _sheet_nrows(file_path, sheet_name, skiprows, columns, transpose) -> Optional[int]:
+    """
+    nrows для чтения листа. Если лист читают и другие ключи EXCEL_SETTINGS,
+    берётся общее для всех число строк — тогда лист разбирается один раз.
+    """
+    need = _rows_needed(columns, transpose)
+    if need is None:
+        return None
+    shared = _rows_by_sheet().get((file_path, sheet_name, _skiprows_key(skiprows)), need)
+    return None if shared is None else max(shared, need)
+@lru_cache(maxsize=32)
+def _read_sheet(full_path: str, sheet_name: str, skiprows: Optional[tuple],
+                nrows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Читает лист Excel один раз за сборку.
+    Несколько ключей EXCEL_SETTINGS берут данные с одного листа сводной
+    таблицы — без кэша он заново разбирался бы для каждого ключа.
+    nrows ограничивает разбор только нужными строками листа.
+    Результат общий для всех вызовов, поэтому изменять его нельзя.
+    """
+    return pd.read_excel(full_path, sheet_name=sheet_name, engine='openpyxl', skiprows=skiprows, nrows=nrows)
 def load_excel(file_path: str,
                sheet_name: str,
                columns: List[int],
@@ -58,25 +112,35 @@ def load_excel(file_path: str,
     Читает Excel-лист и возвращает DataFrame с колонками: date, value
     """
     full_path = f"{DIR}/{file_path}"
-    df_raw = pd.read_excel(full_path, sheet_name=sheet_name, engine='openpyxl', skiprows=skiprows)
-    if transpose:
-        df_raw = df_raw.transpose()
+    nrows = _sheet_nrows(file_path, sheet_name, skiprows, columns, transpose)
+    df_raw = _read_sheet(full_path, sheet_name, _skiprows_key(skiprows), nrows)
     try:
         df_plan = pd.DataFrame(columns=["date", "value"])
-        df_plan[["date", "value"]] = df_raw.iloc[:, columns].copy()
+        if transpose:
+            # нужные колонки транспонированного листа — это строки исходного:
+            # транспонируем только их, а не весь лист
+            df_plan[["date", "value"]] = df_raw.iloc[columns].transpose()
+        else:
+            df_plan[["date", "value"]] = df_raw.iloc[:, columns].copy()
     except Exception as e:
         raise ValueError(f"Ошибка выбора колонок {columns} из {file_path}: {e}")
     if date_range:
-        df_plan["date"] = df_plan["date"].astype(str).apply(parse_month)
+        # различных подписей месяцев — не больше числа месяцев в таблице,
+        # поэтому каждая разбирается один раз, а колонка заполняется по словарю
+        raw_dates = df_plan["date"].astype(str)
+        parsed = {raw: parse_month(raw) for raw in raw_dates.unique()}
+        df_plan["date"] = raw_dates.map(parsed)
     else:
         df_plan["date"] = pd.to_datetime(df_plan["date"], errors="coerce")
     df_plan.reset_index(drop=True, inplace=True)
     if drop_rows:
-        to_drop = [i for i in drop_rows if 0 <= i < len(df_plan)]
-        if to_drop:
-            df_plan.drop(to_drop, inplace=True)
-            df_plan.reset_index(drop=True, inplace=True)
-    df_plan["value"] = pd.to_numeric(df_plan["value"], errors="coerce").fillna(0)
+        to_drop = np.asarray(drop_rows, dtype=np.intp)
+        to_drop = to_drop[(to_drop >= 0) & (to_drop < len(df_plan))]
+        if to_drop.size:
+            keep = np.ones(len(df_plan), dtype=bool)
+            keep[to_drop] = False
+            df_plan = df_plan.iloc[keep].reset_index(drop=True)
+    df_plan["value"] = safe_to_numeric(df_plan["value"])
     if drop_after_rows is not None and drop_after_rows < len(df_plan):
         df_plan = df_plan.iloc[:drop_after_rows].reset_index(drop=True)
     if drop_after_rows_day and df_plan.shape[0] > 0:
@@ -91,7 +155,7 @@ def load_excel(file_path: str,
 def data_from_pairs(pairs: List[List[Any]], param_name: str) -> pd.DataFrame:
     df = pd.DataFrame(pairs, columns=["date", "value"])
     df["date"] = safe_to_datetime(df["date"])
-    df["value"] = pd.to_numeric(df["value"], errors="coerce").fillna(0)
+    df["value"] = safe_to_numeric(df["value"])
     df["param"] = param_name
     df["source_file"] = "manual"
     return df
@@ -132,10 +196,20 @@ def processing_data(file_key: str) -> pd.DataFrame:
 def build_master_table(long_df: pd.DataFrame) -> pd.DataFrame:
     if long_df.empty:
         return pd.DataFrame()
-    long_df = long_df.copy()
-    long_df["date"] = pd.to_datetime(long_df["date"], errors="coerce").dt.normalize()
-    pivot = long_df.pivot_table(index="date", columns="param", values="value", aggfunc="sum")
-    wide = pivot.reset_index().sort_values("date").reset_index(drop=True)
+    # входной DataFrame не меняем и не копируем целиком: assign подменяет
+    # только колонку date, остальные колонки остаются общими
+    dates = pd.to_datetime(long_df["date"], errors="coerce").dt.normalize()
+    # groupby().sum().unstack() — тот же результат, что pivot_table(aggfunc="sum"),
+    # но без её общей обвязки; пропущенные пары (дата, параметр) остаются NaN.
+    # groupby сортирует ключи, так что строки уже идут по дате.
+    #
+    # Параметров — десятки на тысячи строк: категория хэширует каждое имя
+    # один раз, дальше группировка идёт по целочисленным кодам.
+    params = long_df["param"].astype("category")
+    pivot = (long_df.assign(date=dates, param=params)
+             .groupby(["date", "param"], observed=True)["value"].sum().unstack("param"))
+    pivot.columns = pivot.columns.astype(params.cat.categories.dtype)
+    wide = pivot.reset_index()
     return wide
 # -------------------------
 # Полная сборка всех данных
@@ -150,11 +224,18 @@ def build_all_data() -> pd.DataFrame:
             all_frames.append(df_excel)
         except Exception as e:
             print(f"Ошибка при загрузке '{key}': {e}")
+    # разобранные листы больше не нужны — освобождаем память
+    _read_sheet.cache_clear()
     # 2. Manual
     for df in manual_dfs.values():
         all_frames.append(df)
     if not all_frames:
         return pd.DataFrame()
-    combined = pd.concat(all_frames, ignore_index=True)
+    # десятки маленьких кадров: колонки склеиваются numpy одним проходом
+    # вместо выравнивания блоков каждого кадра в pd.concat
+    combined = pd.DataFrame({
+        col: np.concatenate([df[col].to_numpy() for df in all_frames])
+        for col in ("date", "param", "value", "source_file")
+    })
     master_df = build_master_table(combined)
     return master_df
\ No newline at end of file
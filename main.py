@@ -2,6 +2,7 @@ import pandas as pd
 import calculate
 from loader import build_all_data, get_day
 from data_prep import (
+    init_monthly_cache,
     prepare_suzun_data,
     prepare_vo_data,
     prepare_kchng_data,
@@ -20,11 +21,14 @@ from inputs import (
     get_TSTN_inputs
 )
 from excel_export import export_to_excel
-from datetime import timedelta
-import calendar
 
 
-def main():
+def run_month():
+    """
+    Расчёт за все дни текущего месяца без экспорта.
+    Возвращает (result_df, alarm_flag, alarm_msg, calc_date) — экспорт
+    в любой формат вызывает run_month один раз и работает с результатом.
+    """
     # ------------------------------------------------------------------
     # 1. Исходные данные
     # ------------------------------------------------------------------
@@ -33,10 +37,14 @@ def main():
     if "date" not in master_df.columns:
         raise ValueError("master_df не содержит колонку 'date'")
 
-    master_df["date"] = pd.to_datetime(master_df["date"]).dt.normalize()
+    # build_master_table уже отдаёт нормализованные даты — лишний проход по колонке не нужен
+    if not pd.api.types.is_datetime64_any_dtype(master_df["date"]):
+        master_df["date"] = pd.to_datetime(master_df["date"]).dt.normalize()
+
+    cache = init_monthly_cache(master_df)
 
+    # get_day отдаёт уже нормализованные Timestamp — поэлементное приведение не нужно
     dates = get_day()
-    dates = [pd.to_datetime(d).normalize() for d in dates]
 
     # ------------------------------------------------------------------
     # 2. Ручные вводы (ОДИН РАЗ)
@@ -47,6 +55,9 @@ def main():
     rn_vankor_inputs = get_rn_vankor_inputs()
     sikn_1208_inputs = get_sikn_1208_inputs()
     TSTN_inputs = get_TSTN_inputs()
+    # ручные вводы не меняются по дням — берём нужные значения один раз
+    G_suzun_tng = suzun_inputs["G_suzun_tng"]
+    G_ichem = lodochny_inputs["G_ichem"]
 
     # ------------------------------------------------------------------
     # 3. Аккумулятор результатов
@@ -59,42 +70,45 @@ def main():
     # ------------------------------------------------------------------
     # 4. Основной цикл по дням
     # ------------------------------------------------------------------
-    for n in dates:
-        m = n.month
-        prev_day = n - timedelta(days=1)
-        prev_month = n.replace(day=1) - timedelta(days=1)
-        N = calendar.monthrange(n.year, n.month)[1]
+    # календарь считается для всех дней сразу: предыдущие сутки,
+    # последний день прошлого месяца и число дней в месяце
+    prev_days = dates - pd.Timedelta(days=1)
+    prev_months = dates.to_period("M").to_timestamp() - pd.Timedelta(days=1)
+    month_lengths = dates.days_in_month.tolist()
+
+    for n, prev_day, prev_month, N in zip(dates, prev_days, prev_months, month_lengths):
+        tick = cache.tick(n, prev_day, prev_month)
 
         # Словарь результатов за день
         day_result = {"date": n}
 
         # -------------------- СУЗУН -----------------------------------
-        suzun_data = prepare_suzun_data(master_df, n, m, prev_day, prev_month, N)
+        suzun_data = prepare_suzun_data(cache, tick, N)
         suzun_results = calculate.suzun(**suzun_data, **suzun_inputs)
         day_result.update(suzun_results)
 
         # -------------------- ВОСТОК ОЙЛ -------------------------------
-        vo_data = prepare_vo_data(master_df, n, m)
+        vo_data = prepare_vo_data(cache, tick)
         vo_results = calculate.VO(**vo_data)
         day_result.update(vo_results)
 
         # -------------------- КЧНГ -------------------------------------
-        kchng_data = prepare_kchng_data(master_df, n, m)
+        kchng_data = prepare_kchng_data(cache, tick)
         kchng_results = calculate.kchng(**kchng_data)
         day_result.update(kchng_results)
 
         # -------------------- ЛОДОЧНЫЙ ---------------------------------
-        lodochny_data = prepare_lodochny_data(master_df, n, m, prev_day, prev_month, N, n.day, kchng_results)
+        lodochny_data = prepare_lodochny_data(cache, tick, N, n.day, kchng_results)
         lodochny_results = calculate.lodochny(**lodochny_data, **lodochny_inputs)
         day_result.update(lodochny_results)
 
         # -------------------- ЦППН-1 -----------------------------------
-        cppn1_data = prepare_cppn1_data(master_df, n, prev_day, prev_month, lodochny_results)
+        cppn1_data = prepare_cppn1_data(cache, tick, lodochny_results)
         cppn1_results = calculate.CPPN_1(**cppn1_data, **cppn_1_inputs)
         day_result.update(cppn1_results)
 
         # -------------------- РН-ВАНКОР --------------------------------
-        rn_data = prepare_rn_vankor_data(master_df, n, prev_day, N, n.day, m)
+        rn_data = prepare_rn_vankor_data(cache, tick, N, n.day)
         rn_results = calculate.rn_vankor(**rn_data, **rn_vankor_inputs)
 
         alarm_flag = rn_results.pop("__alarm_first_10_days", alarm_flag)
@@ -102,14 +116,11 @@ def main():
         day_result.update(rn_results)
 
         # -------------------- СИКН-1208 --------------------------------
-        G_suzun_tng = suzun_inputs["G_suzun_tng"]
-        sikn_1208_data = prepare_sikn_1208_data( master_df, n, m, prev_month, suzun_results, lodochny_results, G_suzun_tng, cppn1_results)
+        sikn_1208_data = prepare_sikn_1208_data(cache, tick, suzun_results, lodochny_results, G_suzun_tng, cppn1_results)
         sikn_1208_results = calculate.sikn_1208(**sikn_1208_data, **sikn_1208_inputs)
         day_result.update(sikn_1208_results)
         # -------------------- ТСТН -------------------------------------
-        G_ichem = lodochny_inputs["G_ichem"]
-
-        TSTN_data = prepare_TSTN_data(master_df, n, prev_day, prev_month, m, N, sikn_1208_results, lodochny_results, kchng_results, suzun_results, G_ichem, G_suzun_tng)
+        TSTN_data = prepare_TSTN_data(cache, tick, N, sikn_1208_results, lodochny_results, kchng_results, suzun_results, G_ichem, G_suzun_tng)
         TSTN_results = calculate.TSTN(**TSTN_data, **TSTN_inputs)
         day_result.update(TSTN_results)
         # -------------------- СОХРАНЕНИЕ ДНЯ ---------------------------
@@ -120,6 +131,11 @@ def main():
     result_df = pd.DataFrame(result_rows)
     result_df.sort_values("date", inplace=True)
     result_df.reset_index(drop=True, inplace=True)
+    return result_df, alarm_flag, alarm_msg, dates[-1]
+
+
+def main():
+    result_df, alarm_flag, alarm_msg, calc_date = run_month()
     # ------------------------------------------------------------------
     # 6. Экспорт в Excel
     # ------------------------------------------------------------------
@@ -127,11 +143,12 @@ def main():
     export_to_excel(
         master_df=result_df,
         output_path=output_path,
-        calc_date=dates[-1],
+        calc_date=calc_date,
         alarm_flag=alarm_flag,
         alarm_msg=alarm_msg,
         month_column_name="F_bp_month"
     )
 
+
 if __name__ == "__main__":
     main()
\ No newline at end of file